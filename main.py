@@ -2,13 +2,23 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import concurrent.futures
+import multiprocessing
 import fitz  # PyMuPDF
+import numpy as np
+from xxhash import xxh3_64_intdigest
 import webbrowser
 from pathlib import Path
 import re
 import threading
 import csv
+import collections
 import datetime
+from dataclasses import dataclass, field
+import functools
+import mmap
+import pickle
+import sqlite3
+import zlib
 from difflib import SequenceMatcher
 
 # ==========================================
@@ -22,6 +32,33 @@ SUPPORTED_EXTS = {
 }
 
 CLEAN_TRANS = str.maketrans('', '', ' \n\t\r')
+CLEAN_BYTES = b' \n\t\r'  # deletechars for bytes.translate(None, ...)
+
+# Plain-text files at least this big are keyword-searched through mmap, keeping
+# worker memory flat; smaller ones are cheaper to read and scan as bytes
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+# A Deep Inspect chunk: a run of lines with no blank line (two or more newlines) inside
+PARAGRAPH_RE = re.compile(r'[^\n]+(?:\n(?!\n)[^\n]+)*')
+
+# Minimum word-level Jaccard for two chunks to be compared character by character
+JACCARD_PREFILTER = 0.10
+
+# Ref chunks scored per rapidfuzz cdist call; bounds the score matrix to
+# CDIST_BLOCK x len(target) float32s however large the two documents are
+CDIST_BLOCK = 512
+
+# Scan pool size; LOAD_DOCUMENTS_NUMBER_OF_THREADS overrides the CPU count
+# (e.g. lower it for archives on a spinning disk)
+try:
+    MAX_WORKERS = max(1, int(os.environ['LOAD_DOCUMENTS_NUMBER_OF_THREADS']))
+except (KeyError, ValueError):
+    MAX_WORKERS = os.cpu_count() or 1
+
+# Extracted text and token sets are persisted here per file
+# version, so a repeat scan only re-parses files that changed on disk
+INDEX_PATH = os.path.join(os.path.expanduser("~"), ".file_archive_overlap_finder", "index.db")
+INDEX_COLUMNS = {'txt': 'text_blob', 'tok64': 'tokens_blob'}
 
 try:
     import docx
@@ -30,6 +67,83 @@ try:
 except ImportError:
     HAS_DOCX = False
 
+try:
+    from rapidfuzz import fuzz, process
+
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+# ==========================================
+# EXTRACTION CACHE
+# ==========================================
+
+def _file_key(path):
+    """(abspath, mtime_ns, size) - changes whenever the file on disk changes."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+_index_local = threading.local()
+
+
+def _index_conn():
+    """SQLite connection for the current thread; each pool worker opens its own."""
+    conn = getattr(_index_local, 'conn', None)
+    if conn is not None: return conn
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    # WAL lets every worker read while one of them writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, "
+                 "text_blob BLOB, tokens_blob BLOB)")
+    _index_local.conn = conn
+    return conn
+
+
+def _pack(value, kind):
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if kind != 'txt': return b'R' + data  # Hashes don't compress
+    if HAS_ZSTD: return b'Z' + zstandard.ZstdCompressor().compress(data)
+    return b'D' + zlib.compress(data)
+
+
+def _unpack(blob):
+    tag, data = blob[:1], blob[1:]
+    if tag == b'Z': data = zstandard.ZstdDecompressor().decompress(data)
+    elif tag == b'D': data = zlib.decompress(data)
+    return pickle.loads(data)
+
+
+def _cache_get(key, kind):
+    try:
+        row = _index_conn().execute(f"SELECT {INDEX_COLUMNS[kind]} FROM files WHERE path=? AND mtime=? AND size=?",
+                                    key).fetchone()
+        return _unpack(row[0]) if row and row[0] is not None else None
+    except:
+        return None
+
+
+def _cache_put(key, kind, value):
+    try:
+        conn = _index_conn()
+        with conn:
+            # A changed file invalidates every cached column, not just this one
+            conn.execute("DELETE FROM files WHERE path=? AND (mtime!=? OR size!=?)", key)
+            conn.execute("INSERT OR IGNORE INTO files (path, mtime, size) VALUES (?, ?, ?)", key)
+            conn.execute(f"UPDATE files SET {INDEX_COLUMNS[kind]}=? WHERE path=?", (_pack(value, kind), key[0]))
+    except:
+        pass
+
 
 # ==========================================
 # CORE TEXT EXTRACTION (For Keyword Search)
@@ -37,6 +151,59 @@ except ImportError:
 
 def extract_text_from_file(path):
     ext = os.path.splitext(path)[1].lower()
+    if ext not in SUPPORTED_EXTS['pdf'] and ext not in SUPPORTED_EXTS['word']:
+        # Plain text is as cheap to re-read as to cache, so it isn't kept in memory
+        return _read_text(path, ext)
+    try:
+        key = _file_key(path)
+    except OSError:
+        return ""
+    return _extract_text_cached(key)
+
+
+def extract_text_bytes(path):
+    """Lower-cased UTF-8 bytes of the file's text, used by the literal keyword search."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in SUPPORTED_EXTS['pdf'] or ext in SUPPORTED_EXTS['word']:
+        return extract_text_from_file(path).lower().encode('utf-8', 'ignore')
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return b""
+    # bytes.lower() only folds ASCII, so anything else takes the str round trip
+    return data.lower() if data.isascii() else data.decode('utf-8', 'ignore').lower().encode('utf-8')
+
+
+def get_file_tokens(path):
+    try:
+        key = _file_key(path)
+    except OSError:
+        return get_tokens("")
+    return _get_tokens_cached(key)
+
+
+# Parsed PDF/Word text only; entries are whole documents, so keep the count low
+@functools.lru_cache(maxsize=32)
+def _extract_text_cached(key):
+    cached = _cache_get(key, 'txt')
+    if cached is not None: return cached
+    path = key[0]
+    text = _read_text(path, os.path.splitext(path)[1].lower())
+    if text: _cache_put(key, 'txt', text)
+    return text
+
+
+@functools.lru_cache(maxsize=512)
+def _get_tokens_cached(key):
+    cached = _cache_get(key, 'tok64')
+    if cached is not None: return cached
+    tokens = get_tokens(extract_text_from_file(key[0]))
+    if tokens.size: _cache_put(key, 'tok64', tokens)
+    return tokens
+
+
+def _read_text(path, ext):
     text = ""
     try:
         if ext in SUPPORTED_EXTS['pdf']:
@@ -61,29 +228,40 @@ def extract_text_from_file(path):
 # WORKERS
 # ==========================================
 
-def _check_match(raw_text, query, query_rev, use_regex):
+# Set in each pool process by _init_worker; lets queued tasks bail out after Stop
+_STOP_EVENT = None
+
+
+def _init_worker(stop_event):
+    global _STOP_EVENT
+    _STOP_EVENT = stop_event
+
+
+def _stopped():
+    return _STOP_EVENT is not None and _STOP_EVENT.is_set()
+
+
+def _run_guarded(worker, task_data):
+    # A single unreadable file must not abort the rest of its batch
+    try:
+        return worker(task_data)
+    except Exception:
+        return (False, task_data[0], 0)
+
+
+def _run_batch(worker, batch):
+    # One pool submission per batch keeps scheduling and pickling per-chunk, not per-file
+    return [_run_guarded(worker, t) for t in batch]
+
+
+def _check_match(raw_text, pattern):
+    """Regex search on the decoded text."""
     if not raw_text: return (False, "")
     text_lower = raw_text.lower()
-    found = False
-    match_term = ""
-
-    if use_regex:
-        try:
-            match = re.search(query, text_lower)
-            if match: found = True; match_term = match.group(0)
-        except:
-            pass
-    else:
-        text_compressed = text_lower.translate(CLEAN_TRANS)
-        if query in text_compressed:
-            found = True; match_term = query
-        elif query_rev and (query_rev in text_compressed):
-            found = True; match_term = query_rev
-
-    if found:
-        term = match_term if match_term else query
-        start = text_lower.find(term)
-        if start == -1 and not use_regex: start = 0
+    match = pattern.search(text_lower)
+    if match:
+        term = match.group(0)
+        start = text_lower.find(term) if term else match.start()
         if start != -1:
             s = max(0, start - 40);
             e = min(len(text_lower), start + 40)
@@ -93,28 +271,93 @@ def _check_match(raw_text, query, query_rev, use_regex):
     return (False, "")
 
 
+def _check_literal(path, text_bytes, query, query_rev):
+    """
+    Whitespace-insensitive literal search on lower-cased UTF-8 bytes.
+    query / query_rev are already lower-cased, whitespace-free bytes.
+    """
+    if not text_bytes: return (False, "")
+    text_compressed = text_bytes.translate(None, CLEAN_BYTES)
+    if query in text_compressed:
+        term = query
+    elif query_rev and (query_rev in text_compressed):
+        term = query_rev
+    else:
+        return (False, "")
+
+    # Only matching files pay for the original-case text used in the snippet. The
+    # term is located again in that text (whitespace allowed between characters),
+    # since byte offsets in text_bytes don't line up with it (CRLF, case folding)
+    raw_text = extract_text_from_file(path)
+    text_lower = raw_text.lower()
+    match = re.search(r'[ \n\t\r]*'.join(map(re.escape, term.decode('utf-8', 'ignore'))), text_lower)
+    start = match.start() if match else 0
+    s = max(0, start - 40);
+    e = min(len(text_lower), start + 40)
+    snip = raw_text[s:e].replace("\n", " ").strip()
+    return (True, f"...{snip}...")
+
+
+def literal_pattern(query, query_rev=None):
+    """
+    Bytes regex equivalent to the literal search: each character in either
+    case, with optional whitespace between characters. Lets large text files
+    be scanned in place instead of being lowered and stripped in memory.
+    """
+    def one(q):
+        parts = []
+        for c in q:
+            variants = [v.encode('utf-8') for v in sorted({c, c.lower(), c.upper()})]
+            if all(len(v) == 1 for v in variants):
+                parts.append(b'[' + b''.join(re.escape(v) for v in variants) + b']')
+            else:
+                parts.append(b'(?:' + b'|'.join(re.escape(v) for v in variants) + b')')
+        return b'[ \n\t\r]*'.join(parts)
+
+    src = one(query)
+    if query_rev: src += b'|' + one(query_rev)
+    return re.compile(src)
+
+
+def _check_mmap(path, pattern):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = pattern.search(mm)
+            if not match: return (False, "")
+            start = match.start()
+            snip = mm[max(0, start - 40):start + 40].decode('utf-8', 'ignore').replace("\n", " ").strip()
+    return (True, f"...{snip}...")
+
+
 def worker_search_file(task_data):
-    path, query, query_rev, use_regex = task_data
-    full_text = extract_text_from_file(path)
-    res = _check_match(full_text, query, query_rev, use_regex)
+    path, query, query_rev, pattern, mm_pattern = task_data
+    if _stopped(): return (False, path, 0, "")
+    ext = os.path.splitext(path)[1].lower()
+    if pattern is not None:
+        res = _check_match(extract_text_from_file(path), pattern)
+    elif ext in SUPPORTED_EXTS['text'] and os.path.getsize(path) >= MMAP_MIN_BYTES:
+        # The kernel pages the file in as the regex walks it; nothing is copied
+        res = _check_mmap(path, mm_pattern)
+    else:
+        res = _check_literal(path, extract_text_bytes(path), query, query_rev)
     if res[0]: return (True, path, "Text", res[1])
     return (False, path, 0, "")
 
 
 def get_tokens(text):
+    """Sorted unique uint64 hashes of the words longer than 3 characters."""
     words = re.findall(r'\w+', text.lower())
-    return set(w for w in words if len(w) > 3)
+    return np.unique(np.fromiter((xxh3_64_intdigest(w.encode('utf-8')) for w in words if len(w) > 3), dtype=np.uint64))
 
 
 def worker_similarity_scan(task_data):
     target_path, ref_tokens = task_data
-    target_text = extract_text_from_file(target_path)
-    if not target_text: return (False, target_path, 0)
-    target_tokens = get_tokens(target_text)
-    if not target_tokens: return (False, target_path, 0)
+    if _stopped(): return (False, target_path, 0)
+    target_tokens = get_file_tokens(target_path)
+    if not target_tokens.size: return (False, target_path, 0)
 
-    intersection = len(ref_tokens.intersection(target_tokens))
-    union = len(ref_tokens.union(target_tokens))
+    intersection = np.intersect1d(ref_tokens, target_tokens, assume_unique=True).size
+    union = ref_tokens.size + target_tokens.size - intersection
     score = (intersection / union) * 100 if union > 0 else 0
 
     if score > 5.0: return (True, target_path, round(score, 1))
@@ -129,65 +372,90 @@ def worker_similarity_scan(task_data):
 # DEEP INSPECTION LOGIC (Page Aware)
 # ==========================================
 
+@dataclass
+class Chunks:
+    """
+    Deep Inspect chunks of one document, stored as parallel lists (one per
+    field) so the pairwise comparison indexes flat lists instead of dicts.
+    """
+    ids: list = field(default_factory=list)
+    texts: list = field(default_factory=list)
+    pages: list = field(default_factory=list)
+    cleans: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def select(self, idx):
+        return Chunks([self.ids[i] for i in idx], [self.texts[i] for i in idx], [self.pages[i] for i in idx],
+                      [self.cleans[i] for i in idx])
+
+
 class DeepInspector:
     @staticmethod
-    def extract_pages(path):
+    def iter_pages(path):
         """
-        Returns a list of tuples: [(page_num, text), (page_num, text)...]
-        (This method remains unchanged as it handles file reading)
+        Yields (page_num, text) one page at a time, so callers never need
+        the whole document in memory.
         """
         ext = os.path.splitext(path)[1].lower()
-        pages = []
 
         try:
             if ext in SUPPORTED_EXTS['pdf']:
                 with fitz.open(path) as doc:
                     for i, page in enumerate(doc):
-                        pages.append((str(i + 1), page.get_text()))
+                        yield (str(i + 1), page.get_text())
 
             elif ext in SUPPORTED_EXTS['word'] and HAS_DOCX:
                 # Word docs don't have real pages, use Paragraph clusters or just "1"
                 doc = docx.Document(path)
-                full_text = "\n".join([p.text for p in doc.paragraphs])
-                pages.append(("1", full_text))
+                yield ("1", "\n".join([p.text for p in doc.paragraphs]))
 
             else:
                 # Text files
                 with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    pages.append(("1", f.read()))
+                    yield ("1", f.read())
 
         except:
             pass
-        return pages
 
     @staticmethod
     def parse_text_chunks_with_location(path):
         """
         Splits the document into chunks based on two or more newlines.
         Maps each chunk to its starting page number.
-        Returns: [ {'id': '1', 'text': '...', 'page': '5'}, ... ]
+        Returns: Chunks(ids=['1', ...], texts=['...', ...], pages=['5', ...], cleans=[...])
+        Results are memoized per (path, mtime, size), so re-inspecting the same
+        reference file from another row does not parse it again.
         """
-        pages_data = DeepInspector.extract_pages(path)
-        parsed_items = []
-        chunk_id = 1
+        try:
+            key = _file_key(path)
+        except OSError:
+            return Chunks()
+        return DeepInspector._parse_chunks_cached(key)
 
-        for page_num, page_text in pages_data:
-            # Use regex to split text by two or more consecutive newline characters
-            # This creates chunks based on logical paragraph breaks
-            chunks = re.split(r'\n{2,}', page_text.strip())
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _parse_chunks_cached(key):
+        chunks = Chunks()
+        chunk_id = 1
 
-            for chunk in chunks:
-                cleaned_chunk = chunk.strip()
+        # Pages are streamed; only the current page's text is alive at a time
+        for page_num, page_text in DeepInspector.iter_pages(key[0]):
+            # Walk the paragraphs (lines separated by single newlines) in place
+            # rather than building the re.split() list for the page
+            for m in PARAGRAPH_RE.finditer(page_text):
+                cleaned_chunk = m.group(0).strip()
                 if len(cleaned_chunk) > 10:  # Minimum length filter for meaningful chunks
-                    parsed_items.append({
-                        'id': str(chunk_id),
-                        'text': cleaned_chunk,
-                        # For simplicity, assign the entire chunk to the page it starts on.
-                        'page': page_num
-                    })
+                    chunks.ids.append(str(chunk_id))
+                    chunks.texts.append(cleaned_chunk)
+                    # For simplicity, assign the entire chunk to the page it starts on.
+                    chunks.pages.append(page_num)
+                    # Precomputed once here instead of once per compared pair
+                    chunks.cleans.append(cleaned_chunk.lower().translate(CLEAN_TRANS))
                     chunk_id += 1
 
-        return parsed_items
+        return chunks
 
     @staticmethod
     def compare_structure(ref_path, target_path):
@@ -200,41 +468,98 @@ class DeepInspector:
         tgt_data = DeepInspector.parse_text_chunks_with_location(target_path)
         # ------------------------------------------
 
-        results = []
-
-        for ref_item in ref_data:
-            # Filter short chunks
-            if len(ref_item['text']) < 50: continue
-
-            best_score = 0.0
-            best_match_page = "-"
-
-            for tgt_item in tgt_data:
-                if len(tgt_item['text']) < 50: continue
-
-                # Calculate the similarity ratio
-                # You might want to strip common whitespace and case-fold for better matches
-                ref_text_clean = ref_item['text'].lower().translate(CLEAN_TRANS)
-                tgt_text_clean = tgt_item['text'].lower().translate(CLEAN_TRANS)
-
-                ratio = SequenceMatcher(None, ref_text_clean, tgt_text_clean).ratio() * 100
-
-                if ratio > best_score:
-                    best_score = ratio
-                    best_match_page = tgt_item['page']
+        # Filter short chunks
+        ref = ref_data.select([i for i, t in enumerate(ref_data.texts) if len(t) >= 50])
+        tgt = tgt_data.select([i for i, t in enumerate(tgt_data.texts) if len(t) >= 50])
+        if HAS_RAPIDFUZZ:
+            best = DeepInspector._best_matches_rapidfuzz(ref, tgt)
+        else:
+            best = DeepInspector._best_matches_difflib(ref, tgt)
 
+        results = []
+        for i, (best_score, best_match_page) in enumerate(best):
             if best_score > 15:  # Lower the threshold slightly for general text chunk comparison
                 results.append({
-                    'ref_page': ref_item['page'],
+                    'ref_page': ref.pages[i],
                     'tgt_page': best_match_page,
                     'score': round(best_score, 1),
-                    'preview': ref_item['text'][:100].replace('\n', ' ') + "..."
+                    'preview': ref.texts[i][:100].replace('\n', ' ') + "..."
                 })
 
         # Sort by score
         results.sort(key=lambda x: x['score'], reverse=True)
         return results
 
+    @staticmethod
+    def _best_matches_rapidfuzz(ref, tgt):
+        """
+        (best_score, best_page) per ref chunk. Ref rows are scored in blocks of
+        CDIST_BLOCK, in C++ across all cores; pairs under the cutoff come back as 0.
+        """
+        if not len(ref) or not len(tgt): return [(0.0, "-")] * len(ref)
+        best = []
+        for start in range(0, len(ref), CDIST_BLOCK):
+            scores = process.cdist(ref.cleans[start:start + CDIST_BLOCK], tgt.cleans,
+                                   scorer=fuzz.ratio, workers=-1, score_cutoff=15)
+            best_idx = scores.argmax(axis=1)
+            best.extend((float(scores[i, j]), tgt.pages[j]) for i, j in enumerate(best_idx))
+        return best
+
+    @staticmethod
+    def _best_matches_difflib(ref, tgt):
+        """Pure-Python fallback for when rapidfuzz is not installed."""
+        best = []
+        # One matcher for the whole comparison: seq2 holds the ref chunk, so its
+        # b2j index is built once per ref chunk instead of once per pair.
+        # autojunk is off because its popularity heuristic skews repetitive text.
+        sm = SequenceMatcher(autojunk=False)
+
+        # Word sets for the Jaccard prefilter; only this fallback needs them
+        ref_tokens = [frozenset(re.findall(r'\w{4,}', t.lower())) for t in ref.texts]
+        tgt_tokens = [frozenset(re.findall(r'\w{4,}', t.lower())) for t in tgt.texts]
+        tgt_cleans, tgt_pages = tgt.cleans, tgt.pages
+        tgt_lens = [len(c) for c in tgt_cleans]
+        half = len(tgt_cleans) // 2
+
+        for i in range(len(ref)):
+            best_score = 0.0
+            best_match_page = "-"
+
+            rt = ref_tokens[i]
+            ref_len = len(ref.cleans[i])
+            sm.set_seq2(ref.cleans[i])
+
+            # Closest lengths first: they have the highest attainable ratio, so
+            # the best match tends to turn up early and the bounds below bite
+            order = sorted(range(len(tgt_cleans)), key=lambda j: abs(tgt_lens[j] - ref_len))
+
+            for n, j in enumerate(order):
+                # Every remaining target differs in length by at least d, which caps
+                # its ratio at 2*ref_len / (2*ref_len + d); stop once that can't win
+                d = abs(tgt_lens[j] - ref_len)
+                if 200 * ref_len / ((2 * ref_len + d) or 1) <= best_score: break
+                # Nothing close among the better-sized half: the 15% cutoff is out of reach
+                if best_score < 5 and n > half: break
+
+                # Cheap word-overlap prefilter: chunks sharing almost no vocabulary
+                # cannot be near-copies, so skip the expensive sequence match
+                tt = tgt_tokens[j]
+                union = len(rt | tt)
+                if not union or len(rt & tt) / union < JACCARD_PREFILTER: continue
+
+                # Upper bounds first (same gating as difflib's own _fancy_replace)
+                sm.set_seq1(tgt_cleans[j])
+                if sm.real_quick_ratio() * 100 <= best_score or sm.quick_ratio() * 100 <= best_score: continue
+                ratio = sm.ratio() * 100
+
+                if ratio > best_score:
+                    best_score = ratio
+                    best_match_page = tgt_pages[j]
+                    if best_score >= 95: break  # Near-verbatim; no need to keep looking
+
+            best.append((best_score, best_match_page))
+        return best
+
 
 # ==========================================
 # LOGIC
@@ -243,60 +568,129 @@ class DeepInspector:
 class SearchLogic:
     def __init__(self):
         self.stop_flag = False
+        try:
+            _index_conn()  # Creates the index up front, before workers race to do it
+        except (OSError, sqlite3.Error):
+            pass
+        # One pool for the lifetime of the app: worker startup is paid once and
+        # each worker's extraction cache stays warm between searches. Workers are
+        # spawned, never forked, so none inherits this process's SQLite handles.
+        ctx = multiprocessing.get_context('spawn')
+        self.stop_event = ctx.Event()
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=ctx,
+                                                           initializer=_init_worker, initargs=(self.stop_event,))
+        # Plain-text keyword scans are mostly file reads: threads skip the IPC round trip
+        self.thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(32, MAX_WORKERS * 4),
+                                                                 initializer=_init_worker,
+                                                                 initargs=(self.stop_event,))
 
     def get_files(self, folder):
-        valid = set(e for sub in SUPPORTED_EXTS.values() for e in sub)
-        files = []
-        myself = os.path.abspath(__file__)
-        for r, _, fs in os.walk(folder):
-            for f in fs:
-                full = os.path.join(r, f)
-                if os.path.abspath(full) == myself: continue
-                if os.path.splitext(f)[1].lower() in valid:
-                    files.append(full)
-        return files
-
-    def run_keyword_search(self, files, query, regex, cbs):
+        valid = set(e.lstrip('.') for sub in SUPPORTED_EXTS.values() for e in sub)
+        my_name = os.path.basename(__file__)
+
+        def walk(d):
+            # scandir hands back type and inode info from the directory listing,
+            # so most entries never need a separate stat() call
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                return
+            for e in entries:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        yield from walk(e.path)
+                        continue
+                    base, _, ext = e.name.rpartition('.')
+                    if base and ext.lower() in valid:
+                        # inode() costs a syscall on Windows, so only check name-alikes
+                        if e.name == my_name and os.path.samefile(e.path, __file__): continue
+                        yield e.path
+                except OSError:
+                    continue
+
+        return list(walk(folder))
+
+    def run_keyword_search(self, files, query, regex, cbs, reverse=False):
         self.stop_flag = False
+        self.stop_event.clear()
         q_c = query if regex else query.lower().replace(" ", "").replace("\t", "")
-        q_r = None if regex else q_c[::-1]
-        tasks = [(f, q_c, q_r, regex) for f in files]
-        self._run_pool(worker_search_file, tasks, cbs)
+        # Reversed matching doubles the scan of every non-matching file, so it is opt-in
+        q_rev = q_c[::-1] if reverse and not regex else None
+        # Compiled once here; a Pattern pickles as (source, flags) and each
+        # worker recompiles it at most once thanks to re's internal cache
+        mm_pat = None if regex else literal_pattern(q_c, q_rev)
+        pat = re.compile(query, re.IGNORECASE) if regex else None
+        q_r = q_rev.encode('utf-8') if q_rev else None
+        if not regex: q_c = q_c.encode('utf-8')  # Literal search runs on UTF-8 bytes
+        tasks = [(f, q_c, q_r, pat, mm_pat) for f in files]
+        # re holds the GIL for the whole search, so regex tasks stay on processes
+        self._run_pool(worker_search_file, tasks, cbs, text_threads=not regex)
 
     def run_similarity_search(self, files, ref_file, cbs):
         self.stop_flag = False
-        ref_text = extract_text_from_file(ref_file)
-        ref_tokens = get_tokens(ref_text)
-        if not ref_tokens: return
+        self.stop_event.clear()
+        ref_tokens = get_file_tokens(ref_file)
+        if not ref_tokens.size: return
         ref_abs = os.path.abspath(ref_file)
         tasks = [(f, ref_tokens) for f in files if os.path.abspath(f) != ref_abs]
         self._run_pool(worker_similarity_scan, tasks, cbs)
 
-    def _run_pool(self, worker, tasks, cbs):
+    def _iter_pool(self, worker, tasks, cbs, text_threads=False):
+        """
+        Yields worker results as batches complete, reporting progress as it goes.
+        With text_threads, plain-text files go to the thread pool and only
+        PDF/Word files pay for the trip to a worker process.
+        """
         total = len(tasks)
         count = 0
-        matches = 0
-        with concurrent.futures.ProcessPoolExecutor() as ex:
-            fs = {ex.submit(worker, t): t[0] for t in tasks}
-            try:
-                for f in concurrent.futures.as_completed(fs):
-                    if self.stop_flag: ex.shutdown(wait=False); break
+        chunksize = max(1, total // (MAX_WORKERS * 4))
+        thread_tasks = []
+        proc_tasks = tasks
+        if text_threads:
+            text_exts = set(SUPPORTED_EXTS['text'])
+            thread_tasks = [t for t in tasks if os.path.splitext(t[0])[1].lower() in text_exts]
+            proc_tasks = [t for t in tasks if os.path.splitext(t[0])[1].lower() not in text_exts]
+
+        fs = {}
+        for pool, group in ((self.pool, proc_tasks), (self.thread_pool, thread_tasks)):
+            for i in range(0, len(group), chunksize):
+                batch = group[i:i + chunksize]
+                fs[pool.submit(_run_batch, worker, batch)] = batch
+        try:
+            for f in concurrent.futures.as_completed(fs):
+                if self.stop_flag: break
+                batch = fs[f]
+                try:
+                    results = f.result()
+                except Exception:
+                    results = [(False, t[0], 0) for t in batch]
+                for t, res in zip(batch, results):
                     count += 1
-                    try:
-                        res = f.result()
-                        if res[0]:
-                            matches += 1
-                            if cbs.get('on_match'): cbs['on_match'](res)
-                    except:
-                        pass
+                    yield res
                     if cbs.get('on_prog') and (count % 5 == 0 or count == total):
-                        cbs['on_prog'](int(count / total * 100), os.path.basename(fs[f]))
-            except KeyboardInterrupt:
-                ex.shutdown(wait=False)
+                        cbs['on_prog'](count, total, os.path.basename(t[0]))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for f in fs: f.cancel()  # Drops whatever is still queued
+
+    def _run_pool(self, worker, tasks, cbs, text_threads=False):
+        matches = 0
+        for res in self._iter_pool(worker, tasks, cbs, text_threads):
+            if res[0]:
+                matches += 1
+                if cbs.get('on_match'): cbs['on_match'](res)
         if cbs.get('on_done'): cbs['on_done'](matches)
 
     def stop(self):
         self.stop_flag = True
+        self.stop_event.set()
+
+    def shutdown(self):
+        self.stop()
+        # Queued tasks short-circuit on the stop event, so waiting here is quick
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.thread_pool.shutdown(wait=True, cancel_futures=True)
 
 
 # ==========================================
@@ -312,8 +706,12 @@ class SearchGUI:
         self.last_search_type = None
         self.last_search_query = None
         self._init_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.selected_folder = ""
         self.is_searching = False
+        # Matches arrive from the search thread; they are inserted in batches by _flush
+        self._match_buffer = collections.deque()
+        self._flush_job = None
 
     def _init_ui(self):
         top = tk.Frame(self.root, pady=10);
@@ -335,6 +733,8 @@ class SearchGUI:
         self.entry.bind('<Return>', lambda e: self.start_keyword())
         self.var_reg = tk.BooleanVar()
         tk.Checkbutton(lf, text="Regex", variable=self.var_reg).pack(side="left")
+        self.var_rev = tk.BooleanVar(value=False)
+        tk.Checkbutton(lf, text="Also search reversed", variable=self.var_rev).pack(side="left")
         self.btn_key = tk.Button(lf, text="Search", command=self.start_keyword, bg="#d1e7dd")
         self.btn_key.pack(side="left", padx=5)
 
@@ -404,6 +804,10 @@ class SearchGUI:
             action[e.keycode]();
             return "break"
 
+    def on_close(self):
+        self.logic.shutdown()
+        self.root.destroy()
+
     def browse_folder(self):
         f = filedialog.askdirectory()
         if f: self.selected_folder = f; self.lbl_path.config(text=f, fg="black")
@@ -412,6 +816,11 @@ class SearchGUI:
         if not self.check_ready(): return
         q = self.entry.get();
         if not q: return messagebox.showwarning("Warn", "Enter text.")
+        if self.var_reg.get():
+            try:
+                re.compile(q)
+            except re.error as ex:
+                return messagebox.showwarning("Warn", f"Invalid regex: {ex}")
         self.last_search_type = "Keyword";
         self.last_search_query = q
         self.prep_search("Indexing...");
@@ -435,6 +844,8 @@ class SearchGUI:
         self.btn_key.config(state="disabled");
         self.btn_sim.config(state="disabled")
         for i in self.tree.get_children(): self.tree.delete(i)
+        self._match_buffer.clear()
+        self._flush_job = self.root.after(100, self._flush)
         self.lbl_stat.config(text=msg);
         self.root.update()
 
@@ -444,19 +855,24 @@ class SearchGUI:
 
     def thread_key(self, q):
         files = self.logic.get_files(self.selected_folder)
-        self.run_common(files, lambda f, cbs: self.logic.run_keyword_search(f, q, self.var_reg.get(), cbs))
+        regex, rev = self.var_reg.get(), self.var_rev.get()
+        self.run_common(files, lambda f, cbs: self.logic.run_keyword_search(f, q, regex, cbs, rev))
 
     def thread_sim(self, ref):
         files = self.logic.get_files(self.selected_folder)
         self.run_common(files, lambda f, cbs: self.logic.run_similarity_search(f, ref, cbs))
 
     def run_common(self, files, func):
-        self.root.after(0, lambda: self.prog.configure(maximum=len(files)))
-        cbs = {'on_match': lambda r: self.root.after(0, lambda: self.add_row(r)),
-               'on_prog': lambda p, n: self.root.after(0, lambda: self.update_ui(p, n)),
+        cbs = {'on_match': self._match_buffer.append,
+               'on_prog': lambda c, t, n: self.root.after(0, lambda: self.update_ui(c, t, n)),
                'on_done': lambda c: self.root.after(0, lambda: self.done(c))}
         func(files, cbs)
 
+    def _flush(self):
+        """Inserts buffered matches; one Tk event per 100 ms instead of one per match."""
+        while self._match_buffer: self.add_row(self._match_buffer.popleft())
+        self._flush_job = self.root.after(100, self._flush) if self.is_searching else None
+
     def add_row(self, r):
         full = r[1];
         name = os.path.basename(full)
@@ -477,12 +893,15 @@ class SearchGUI:
 
         self.tree.insert("", "end", values=vals, tags=(row_tag,))
 
-    def update_ui(self, p, n):
-        self.prog['value'] = int(p * self.prog['maximum'] / 100);
+    def update_ui(self, count, total, n):
+        self.prog['maximum'] = total;
+        self.prog['value'] = count;
         self.lbl_stat.config(text=f"Scanning: {n[:40]}...")
 
     def done(self, c):
         self.is_searching = False;
+        if self._flush_job: self.root.after_cancel(self._flush_job)
+        self._flush()
         self.btn_key.config(state="normal");
         self.btn_sim.config(state="normal")
         if c > 0: self.btn_export.config(state="normal")
@@ -660,8 +1079,6 @@ class InspectWindow:
                 messagebox.showerror("Open Error", f"Could not open file:\n{ex}")
 
 if __name__ == "__main__":
-    import multiprocessing
-
     multiprocessing.freeze_support()
     root = tk.Tk()
     app = SearchGUI(root)